@@ -0,0 +1,157 @@
+
+"""
+Benchmark thời gian khởi động (cold start) của CLI theo từng subcommand.
+
+Mỗi lệnh được chạy trong process mới với `python -X importtime`, dùng tham số
+khiến lệnh thoát sớm (file/thư mục không tồn tại, --since sai...) để không
+chạm tới mạng hay DB. Kết quả: wall time (median), tổng thời gian import,
+các package nặng nhất (self time cộng theo package gốc, ở mọi độ sâu) và
+dependency nặng nào (pandas, aiohttp, bs4/lxml, SQLAlchemy, dotenv...) bị load.
+
+    python benchmarks/cli_startup.py
+    python benchmarks/cli_startup.py --runs 10 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+
+MISSING = "__missing__"
+
+# Dependency nặng cần theo dõi: lệnh nào load cái nào
+HEAVY_MODULES = ("pandas", "aiohttp", "bs4", "lxml", "sqlalchemy", "psycopg2", "dotenv", "pyarrow")
+
+COMMANDS = {
+    "help": ["--help"],
+    "crawl": ["crawl", "--input", f"{MISSING}.csv", "--output", "data", "--log-dir", "logs"],
+    "retry": ["retry", "--log-file", f"{MISSING}.txt"],
+    "ingest": ["ingest", "--data-dir", MISSING],
+    "export": ["export", "--output", "out.parquet", "--since", "not-a-date"],
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parse output của -X importtime.
+    Trả về (tổng self time us, {package gốc: tổng self us}, {heavy module: cumulative us}).
+
+    Self time được cộng theo package gốc của MỌI dòng (kể cả dòng thụt lề), vì sau khi
+    import lazy, các dependency nặng nằm lồng bên dưới tiki_scraper.* chứ không ở top-level.
+    """
+    total_self = 0
+    by_package = {}
+    heavy = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+        module = name.strip()
+        pkg = module.split(".")[0]
+        total_self += self_us
+        by_package[pkg] = by_package.get(pkg, 0) + self_us
+        if module in HEAVY_MODULES:
+            heavy[module] = cumulative_us
+    return total_self, by_package, heavy
+
+
+def run_once(args, workdir):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = SRC_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    env.pop("DISCORD_WEBHOOK_URL", None)
+    cmd = [sys.executable, "-X", "importtime", "-m", "tiki_scraper.cli"] + args
+
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=workdir, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    return wall, proc
+
+
+def bench(name, args, runs, top):
+    walls = []
+    import_us = []
+    packages = {}
+    heavy = {}
+    exit_codes = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(runs):
+            wall, proc = run_once(args, workdir)
+            total_self, by_package, heavy_us = parse_importtime(proc.stderr)
+            walls.append(wall)
+            import_us.append(total_self)
+            exit_codes.append(proc.returncode)
+            # Cộng dồn để lấy median theo từng package, không chỉ run cuối
+            for pkg, us in by_package.items():
+                packages.setdefault(pkg, []).append(us)
+            for module, us in heavy_us.items():
+                heavy.setdefault(module, []).append(us)
+
+    medians = {pkg: statistics.median(values) for pkg, values in packages.items()}
+    heaviest = sorted(medians.items(), key=lambda x: x[1], reverse=True)[:top]
+    heavy_ms = {m: round(statistics.median(heavy[m]) / 1000, 1) for m in HEAVY_MODULES if m in heavy}
+    failed = [code for code in exit_codes if code != 0]
+    return {
+        "command": name,
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(statistics.median(import_us) / 1000, 1),
+        "packages": len(medians),
+        "heaviest": [{"package": p, "self_ms": round(us / 1000, 1)} for p, us in heaviest],
+        # Dependency nặng đã load + cumulative ms (module không có mặt = không bị import)
+        "heavy_modules": heavy_ms,
+        # Khác 0 nếu BẤT KỲ run nào lỗi (số liệu khi đó không phản ánh đủ chi phí import)
+        "exit_code": failed[0] if failed else 0,
+        "failed_runs": len(failed),
+    }
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"phải >= 1: {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start time of tiki_scraper CLI subcommands")
+    parser.add_argument("--runs", type=_positive_int, default=5, help="Runs per subcommand (median is reported)")
+    parser.add_argument("--top", type=_positive_int, default=5, help="Number of heaviest packages (by self import time) to show")
+    parser.add_argument("--only", nargs="*", choices=list(COMMANDS), help="Only benchmark these subcommands")
+    parser.add_argument("--json", default=None, help="Write results to this JSON file (for tracking over time)")
+    args = parser.parse_args()
+
+    results = []
+    for name, cmd_args in COMMANDS.items():
+        if args.only and name not in args.only:
+            continue
+        res = bench(name, cmd_args, args.runs, args.top)
+        results.append(res)
+
+        heaviest = ", ".join(f"{h['package']} {h['self_ms']}ms" for h in res["heaviest"])
+        deps = ", ".join(f"{m} {ms}ms" for m, ms in res["heavy_modules"].items()) or "-"
+        status = ""
+        if res["exit_code"] != 0:
+            status = f" ⚠️ exit {res['exit_code']} ở {res['failed_runs']}/{args.runs} run (thiếu dependency?)"
+        print(f"{name:<8} wall {res['wall_ms']:>7.1f}ms | import {res['import_ms']:>7.1f}ms | deps: {deps} | top: {heaviest}{status}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "runs": args.runs, "results": results}, f, indent=2)
+        print(f"💾 Đã lưu kết quả -> {args.json}")
+
+    if any(res["exit_code"] != 0 for res in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,13 @@ setup(
         "beautifulsoup4",
         "lxml",
         "pandas",
+        "SQLAlchemy",
+        "psycopg2-binary",
+        "python-dotenv",
     ],
+    extras_require={
+        "parquet": ["pyarrow"],
+    },
     entry_points={
         'console_scripts': [
             'tiki-scraper=tiki_scraper.cli:main',
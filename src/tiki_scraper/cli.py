@@ -1,15 +1,23 @@
 
 import argparse
-import asyncio
 import os
-from .pipelines.crawl_pipeline import TikiPipeline
-from .etl.load import load_data_to_postgres
-from .utils.logger import setup_logger
-from .config.settings import LOG_DIR, DATA_DIR
+from datetime import datetime
+
+# Các dependency nặng (pandas, aiohttp, bs4/lxml, SQLAlchemy, dotenv) được import
+# bên trong từng cmd_* để `--help` và các lệnh nhẹ không phải trả chi phí khởi động.
+# Đo bằng: python benchmarks/cli_startup.py
 
 def cmd_crawl(args):
     """Lệnh chạy Crawler"""
-    pipeline = TikiPipeline(input_file=args.input, output_dir=args.output, log_dir=args.log_dir)
+    import asyncio
+    from .pipelines.crawl_pipeline import TikiPipeline
+
+    scheduler = None
+    if args.schedule:
+        from .pipelines.scheduler import RefreshScheduler
+        min_score = args.min_score if args.min_score is not None else 0.0
+        scheduler = RefreshScheduler(min_score=min_score, max_ids=args.max_ids)
+    pipeline = TikiPipeline(input_file=args.input, output_dir=args.output, log_dir=args.log_dir, scheduler=scheduler)
     try:
         asyncio.run(pipeline.run())
     except KeyboardInterrupt:
@@ -17,6 +25,10 @@ def cmd_crawl(args):
 
 def cmd_retry(args):
     """Lệnh Retry các failed IDs"""
+    import asyncio
+    from .pipelines.crawl_pipeline import TikiPipeline
+    from .config.settings import LOG_DIR, DATA_DIR
+
     log_file = args.log_file
     if not os.path.exists(log_file):
         print(f"❌ Log file not found: {log_file}")
@@ -47,6 +59,8 @@ def cmd_retry(args):
 
 def cmd_ingest(args):
     """Lệnh Ingest vào DB"""
+    from .etl.load import load_data_to_postgres
+
     data_dir = args.data_dir
     if not os.path.exists(data_dir):
         print(f"❌ Data directory not found: {data_dir}")
@@ -60,6 +74,56 @@ def cmd_ingest(args):
         
     print("✅ Hoàn tất Ingest!")
 
+def cmd_export(args):
+    """Lệnh Export bảng tiki_products ra Parquet/CSV"""
+    from sqlalchemy.exc import SQLAlchemyError
+    from .etl.export import export_products
+    from .utils.logger import setup_logger
+
+    bounds = {}
+    for name in ('since', 'until'):
+        value = getattr(args, name)
+        if not value:
+            bounds[name] = None
+            continue
+        try:
+            bounds[name] = datetime.fromisoformat(value)
+        except ValueError:
+            print(f"❌ --{name} không hợp lệ (cần ISO format, vd 2024-01-31 hoặc 2024-01-31T08:00:00): {value}")
+            return
+
+    fmt = args.format
+    if fmt is None:
+        fmt = 'csv' if args.output.lower().endswith('.csv') else 'parquet'
+
+    columns = args.columns.split(',') if args.columns else None
+
+    setup_logger(args.log_dir)
+    try:
+        total = export_products(args.output, fmt=fmt, columns=columns, since=bounds['since'], until=bounds['until'], chunk_size=args.chunk_size)
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return
+    except SQLAlchemyError as e:
+        print(f"❌ Database Error: {e}")
+        return
+    except ImportError as e:
+        print(f"❌ Thiếu thư viện DB driver (psycopg2?): {e}")
+        return
+    print(f"✅ Hoàn tất Export: {total:,} dòng -> {args.output}")
+
+def _score(value):
+    score = float(value)
+    if not 0.0 <= score <= 1.0:
+        raise argparse.ArgumentTypeError(f"phải nằm trong [0, 1]: {value}")
+    return score
+
+def _positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"phải > 0: {value}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(description="Tiki Scraper Tool v2.0 (Refactored)")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
@@ -69,6 +133,9 @@ def main():
     crawl_parser.add_argument("--input", required=True, help="Path to input CSV file")
     crawl_parser.add_argument("--output", default="data", help="Output directory")
     crawl_parser.add_argument("--log-dir", default="logs", help="Log directory")
+    crawl_parser.add_argument("--schedule", action="store_true", help="Order pending IDs by price-change frequency and time since last crawl")
+    crawl_parser.add_argument("--min-score", type=_score, default=None, help="With --schedule: skip IDs whose refresh score is below this (0..1)")
+    crawl_parser.add_argument("--max-ids", type=_positive_int, default=None, help="With --schedule: crawl at most N highest-priority IDs")
 
     # Command: retry
     retry_parser = subparsers.add_parser("retry", help="Retry failed IDs from logs")
@@ -78,14 +145,32 @@ def main():
     ingest_parser = subparsers.add_parser("ingest", help="Ingest JSON data to PostgreSQL")
     ingest_parser.add_argument("--data-dir", default="data", help="Directory containing JSON files")
 
+    # Command: export. choices/default phải giữ đồng bộ với etl.export.EXPORT_FORMATS / DEFAULT_CHUNK_SIZE
+    # (không import etl.export ở đây để --help không load SQLAlchemy)
+    export_parser = subparsers.add_parser("export", help="Export tiki_products from PostgreSQL to Parquet/CSV (streaming)")
+    export_parser.add_argument("--output", required=True, help="Output file path (.parquet or .csv)")
+    export_parser.add_argument("--format", choices=("parquet", "csv"), default=None, help="Output format (default: guessed from --output)")
+    export_parser.add_argument("--since", default=None, help="Only export rows with crawled_at > SINCE (ISO timestamp)")
+    export_parser.add_argument("--until", default=None, help="Only export rows with crawled_at <= UNTIL (ISO timestamp)")
+    export_parser.add_argument("--columns", default=None, help="Comma-separated columns to export (default: all)")
+    export_parser.add_argument("--chunk-size", type=_positive_int, default=10000, help="Rows fetched per cursor round-trip / row group")
+    export_parser.add_argument("--log-dir", default="logs", help="Log directory")
+
     args = parser.parse_args()
 
+    if args.command == "crawl" and not args.schedule and (args.min_score is not None or args.max_ids is not None):
+        crawl_parser.error("--min-score/--max-ids chỉ dùng được cùng --schedule")
+    if args.command == "crawl" and args.schedule and os.path.abspath(args.output) == os.path.abspath("data"):
+        crawl_parser.error("--schedule cần một thư mục output riêng cho mỗi lượt refresh (vd --output data/refresh_20240131), không dùng thư mục data chung")
+
     if args.command == "crawl":
         cmd_crawl(args)
     elif args.command == "retry":
         cmd_retry(args)
     elif args.command == "ingest":
         cmd_ingest(args)
+    elif args.command == "export":
+        cmd_export(args)
     else:
         parser.print_help()
 
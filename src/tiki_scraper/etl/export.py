@@ -0,0 +1,155 @@
+
+import csv
+import logging
+import os
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from .load import get_engine
+
+# Cột của bảng tiki_products (thứ tự = thứ tự trong file export)
+EXPORT_COLUMNS = ['id', 'name', 'url_key', 'price', 'description', 'images_url', 'crawled_at']
+# Giữ đồng bộ với choices/default của lệnh `export` trong cli.py
+EXPORT_FORMATS = ('parquet', 'csv')
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def build_export_query(columns=None, since=None, until=None):
+    """
+    Tạo câu SELECT cho export, filter theo crawled_at (incremental export).
+    Tên cột được kiểm tra với EXPORT_COLUMNS, giá trị filter đi qua bind params.
+    """
+    columns = list(columns or EXPORT_COLUMNS)
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Cột không hợp lệ: {', '.join(unknown)}")
+
+    conditions = []
+    params = {}
+    if since is not None:
+        conditions.append("crawled_at > :since")
+        params['since'] = since
+    if until is not None:
+        conditions.append("crawled_at <= :until")
+        params['until'] = until
+
+    sql = f"SELECT {', '.join(columns)} FROM tiki_products"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY id"
+    return text(sql), params, columns
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Export Parquet cần pyarrow: pip install 'tiki_scraper[parquet]' (hoặc pip install pyarrow)")
+
+
+def _parquet_schema(columns):
+    import pyarrow as pa
+    types = {
+        'id': pa.int64(),
+        'name': pa.string(),
+        'url_key': pa.string(),
+        'price': pa.float64(),
+        'description': pa.string(),
+        'images_url': pa.string(),
+        'crawled_at': pa.timestamp('us'),
+    }
+    return pa.schema([(c, types[c]) for c in columns])
+
+
+class _CsvWriter:
+    def __init__(self, path, columns):
+        self.f = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.f)
+        self.writer.writerow(columns)
+
+    def write_chunk(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.f.close()
+
+
+class _ParquetWriter:
+    """Mỗi chunk từ cursor được ghi thành một row group riêng."""
+
+    def __init__(self, path, columns):
+        _require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.columns = columns
+        self.schema = _parquet_schema(columns)
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.price_idx = columns.index('price') if 'price' in columns else None
+
+    def write_chunk(self, rows):
+        # NUMERIC -> Decimal, ép về float để khớp schema
+        arrays = []
+        for i, col in enumerate(self.columns):
+            values = [row[i] for row in rows]
+            if i == self.price_idx:
+                values = [float(v) if v is not None else None for v in values]
+            arrays.append(self.pa.array(values, type=self.schema.field(col).type))
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def export_products(output_path, fmt='parquet', columns=None, since=None, until=None,
+                    chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Export bảng tiki_products ra Parquet/CSV theo kiểu streaming.
+    Dùng server-side cursor (stream_results) nên RAM chỉ giữ tối đa 1 chunk,
+    không phụ thuộc kích thước bảng. Trả về số dòng đã ghi.
+    """
+    logger = logging.getLogger("TikiScraper")
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format không hỗ trợ: {fmt}")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size phải > 0")
+
+    query, params, columns = build_export_query(columns, since, until)
+    if fmt == 'parquet':
+        _require_pyarrow()  # Fail sớm, trước khi mở connection/cursor
+
+    out_dir = os.path.dirname(output_path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+
+    writer_cls = _ParquetWriter if fmt == 'parquet' else _CsvWriter
+    engine = get_engine()
+    total = 0
+    writer = None
+    # Ghi ra file tạm rồi mới os.replace -> không bao giờ để lại snapshot bị cắt cụt ở output_path
+    temp_path = f"{output_path}.partial"
+
+    try:
+        with engine.connect() as conn:
+            # stream_results=True -> psycopg2 named cursor, fetch từng chunk từ server
+            result = conn.execution_options(stream_results=True, max_row_buffer=chunk_size).execute(query, params)
+            writer = writer_cls(temp_path, columns)
+            for rows in result.partitions(chunk_size):
+                writer.write_chunk(rows)
+                total += len(rows)
+                logger.info(f"📤 Export: đã ghi {total:,} dòng -> {output_path}")
+        writer.close()
+        writer = None
+        os.replace(temp_path, output_path)
+    except SQLAlchemyError as e:
+        logger.error(f"❌ Database Error: {e}")
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    logger.info(f"✅ Export xong {total:,} dòng ({fmt}) -> {output_path}")
+    return total
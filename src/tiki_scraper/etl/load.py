@@ -31,10 +31,50 @@ def init_db():
         crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
     """
+    # Lịch sử giá append-only, partition theo tháng (xem ensure_price_history_partition)
+    create_history_sql = """
+    CREATE TABLE IF NOT EXISTS tiki_price_history (
+        product_id BIGINT NOT NULL,
+        price NUMERIC,
+        changed_at TIMESTAMP NOT NULL
+    ) PARTITION BY RANGE (changed_at);
+    CREATE INDEX IF NOT EXISTS idx_price_history_product
+        ON tiki_price_history (product_id, changed_at);
+    """
     with engine.connect() as conn:
         conn.execute(text(create_table_sql))
+        history_exists = conn.execute(text("SELECT to_regclass('tiki_price_history')")).scalar() is not None
+        conn.execute(text(create_history_sql))
+        if not history_exists:
+            seed_price_history(conn)
         conn.commit()
 
+def seed_price_history(conn):
+    """
+    Lần đầu tạo tiki_price_history: lấy giá hiện tại của tiki_products làm baseline
+    (changed_at = crawled_at), để lần đổi giá đầu tiên được tính là 1 thay đổi thật.
+    """
+    months = conn.execute(text("""
+        SELECT DISTINCT date_trunc('month', COALESCE(crawled_at, LOCALTIMESTAMP))
+        FROM tiki_products;
+    """)).scalars().all()
+    for month in months:
+        ensure_price_history_partition(conn, month)
+    conn.execute(text("""
+        INSERT INTO tiki_price_history (product_id, price, changed_at)
+        SELECT id, price, COALESCE(crawled_at, LOCALTIMESTAMP) FROM tiki_products;
+    """))
+
+def ensure_price_history_partition(conn, ts):
+    """Tạo partition tháng chứa ts cho tiki_price_history nếu chưa có"""
+    start = ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    partition = f"tiki_price_history_{start:%Y_%m}"
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {partition} PARTITION OF tiki_price_history
+        FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}');
+    """))
+
 def load_data_to_postgres(file_path):
     """Load JSON data vào Postgres"""
     logger = logging.getLogger("TikiScraper")
@@ -49,6 +89,17 @@ def load_data_to_postgres(file_path):
         engine = get_engine()
         init_db() # Ensure table exists
 
+        # Ghi lịch sử giá TRƯỚC khi upsert: chỉ khi sản phẩm mới hoặc giá thay đổi.
+        # Set-based (1 câu lệnh/file); ID trùng trong file -> giữ giá cuối (giống thứ tự upsert).
+        history_sql = text("""
+            INSERT INTO tiki_price_history (product_id, price, changed_at)
+            SELECT v.id, v.price, :changed_at
+            FROM unnest(CAST(:ids AS BIGINT[]), CAST(:prices AS NUMERIC[])) AS v(id, price)
+            LEFT JOIN tiki_products p ON p.id = v.id
+            WHERE p.id IS NULL OR p.price IS DISTINCT FROM v.price;
+        """)
+        latest_prices = {int(d['id']): d.get('price') for d in data}
+
         # UPSERT Logic (Insert or Update if exists)
         upsert_sql = text("""
             INSERT INTO tiki_products (id, name, url_key, price, description, images_url)
@@ -62,6 +113,14 @@ def load_data_to_postgres(file_path):
         """)
         
         with engine.connect() as conn:
+            # Dùng đồng hồ của DB (cùng nguồn với crawled_at = CURRENT_TIMESTAMP trong transaction này)
+            changed_at = conn.execute(text("SELECT LOCALTIMESTAMP")).scalar()
+            ensure_price_history_partition(conn, changed_at)
+            conn.execute(history_sql, {
+                'ids': list(latest_prices.keys()),
+                'prices': list(latest_prices.values()),
+                'changed_at': changed_at,
+            })
             conn.execute(upsert_sql, data)
             conn.commit()
             
@@ -12,11 +12,12 @@ from ..utils.logger import setup_logger
 from ..utils.discord import send_discord_webhook, edit_discord_message
 
 class TikiPipeline:
-    def __init__(self, input_file, output_dir=DATA_DIR, log_dir=LOG_DIR, retry_mode=False):
+    def __init__(self, input_file, output_dir=DATA_DIR, log_dir=LOG_DIR, retry_mode=False, scheduler=None):
         self.input_file = input_file
         self.output_dir = output_dir
         self.log_dir = log_dir
         self.retry_mode = retry_mode
+        self.scheduler = scheduler  # RefreshScheduler (tùy chọn): sắp xếp/lọc pending IDs
         
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
@@ -50,6 +51,21 @@ class TikiPipeline:
         try:
             df = pd.read_csv(self.input_file, dtype={'id': str})
             all_ids = set(df['id'].dropna().unique())
+
+            if self.scheduler:
+                # Refresh: DB (crawled_at + lịch sử giá) chọn ID cần crawl lại, sau đó bỏ các ID
+                # đã có trong thư mục refresh này để resume được như crawl thường.
+                # Input của lượt refresh = danh sách đã xếp hạng, "đã xong" = phần đã có trong output_dir.
+                ranked_ids = self.scheduler.order(list(all_ids))
+                completed_ids = self.get_completed_ids()
+                pending_ids = [pid for pid in ranked_ids if pid not in completed_ids]
+                done_count = len(ranked_ids) - len(pending_ids)
+                self.logger.info(
+                    f"Tổng ID: {len(all_ids)} | Cần refresh: {len(ranked_ids)} | "
+                    f"Đã xong: {done_count} | Còn lại: {len(pending_ids)}"
+                )
+                return pending_ids, len(ranked_ids), done_count
+
             completed_ids = self.get_completed_ids()
             
             pending_ids = list(all_ids - completed_ids)
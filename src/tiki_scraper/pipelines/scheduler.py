@@ -0,0 +1,110 @@
+
+import logging
+import math
+
+SECONDS_PER_DAY = 86400.0
+
+# Prior cho sản phẩm ít lịch sử: coi như đã quan sát PRIOR_DAYS ngày với PRIOR_CHANGES lần đổi giá
+PRIOR_CHANGES = 0.5
+PRIOR_DAYS = 7.0
+
+
+def change_rate(n_changes, span_days):
+    """
+    Ước lượng tần suất đổi giá (lần/ngày) từ lịch sử, có làm mượt bằng prior
+    để sản phẩm mới/ít dữ liệu không bị coi là "không bao giờ đổi".
+    """
+    n_changes = max(n_changes or 0, 0)
+    span_days = max(span_days or 0.0, 0.0)
+    return (n_changes + PRIOR_CHANGES) / (span_days + PRIOR_DAYS)
+
+
+def refresh_score(rate, age_days):
+    """
+    Xác suất giá đã đổi kể từ lần crawl cuối (mô hình Poisson): 1 - e^(-rate * age).
+    Sản phẩm biến động nhiều hoặc lâu chưa crawl -> điểm gần 1.
+    """
+    return 1.0 - math.exp(-rate * max(age_days, 0.0))
+
+
+class RefreshScheduler:
+    """
+    Sắp xếp pending IDs theo độ "cũ" ước lượng, dựa trên tiki_price_history
+    và crawled_at của tiki_products. ID chưa có trong DB luôn được ưu tiên cao nhất.
+    """
+
+    def __init__(self, min_score=0.0, max_ids=None, logger=None):
+        if not 0.0 <= min_score <= 1.0:
+            raise ValueError("min_score phải nằm trong [0, 1]")
+        if max_ids is not None and max_ids <= 0:
+            raise ValueError("max_ids phải > 0")
+        self.min_score = min_score
+        self.max_ids = max_ids
+        self.logger = logger or logging.getLogger("TikiScraper")
+
+    def fetch_stats(self, product_ids):
+        """Trả về {id(str): (n_changes, span_days, age_days)} cho các ID đã có trong DB"""
+        # Import tại chỗ: phần tính điểm không cần SQLAlchemy
+        from sqlalchemy import text
+        from ..etl.load import get_engine
+
+        ids = [int(pid) for pid in product_ids if str(pid).isdigit()]
+        if not ids:
+            return {}
+
+        stats_sql = text("""
+            SELECT p.id,
+                   COALESCE(h.n_changes, 0) AS n_changes,
+                   EXTRACT(EPOCH FROM (p.crawled_at - h.first_seen)) AS span_s,
+                   EXTRACT(EPOCH FROM (LOCALTIMESTAMP - p.crawled_at)) AS age_s
+            FROM tiki_products p
+            LEFT JOIN (
+                SELECT product_id, COUNT(*) - 1 AS n_changes, MIN(changed_at) AS first_seen
+                FROM tiki_price_history
+                WHERE product_id = ANY(:ids)
+                GROUP BY product_id
+            ) h ON h.product_id = p.id
+            WHERE p.id = ANY(:ids);
+        """)
+
+        stats = {}
+        engine = get_engine()
+        with engine.connect() as conn:
+            for row in conn.execute(stats_sql, {'ids': ids}):
+                span_days = float(row.span_s or 0) / SECONDS_PER_DAY
+                age_days = float(row.age_s or 0) / SECONDS_PER_DAY
+                stats[str(row.id)] = (int(row.n_changes), span_days, age_days)
+        return stats
+
+    def order(self, pending_ids):
+        """
+        Sắp xếp pending IDs theo refresh_score giảm dần, bỏ các ID dưới min_score
+        và cắt theo max_ids. Nếu không đọc được DB (lỗi query, thiếu driver...) thì giữ nguyên danh sách.
+        """
+        try:
+            stats = self.fetch_stats(pending_ids)
+        except Exception as e:
+            self.logger.error(f"❌ Scheduler: Không đọc được thống kê từ DB, giữ nguyên thứ tự: {e}")
+            return self._limit(list(pending_ids))
+
+        scored = []
+        for pid in pending_ids:
+            if pid in stats:
+                n_changes, span_days, age_days = stats[pid]
+                score = refresh_score(change_rate(n_changes, span_days), age_days)
+            else:
+                score = 1.0  # Chưa từng crawl
+            if score >= self.min_score:
+                scored.append((score, pid))
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        ordered = self._limit([pid for _, pid in scored])
+
+        self.logger.info(
+            f"🗓️ Scheduler: {len(pending_ids)} ID -> {len(ordered)} ID cần refresh "
+            f"(đã biết: {len(stats)} | bỏ qua: {len(pending_ids) - len(ordered)})"
+        )
+        return ordered
+
+    def _limit(self, ids):
+        return ids[:self.max_ids] if self.max_ids is not None else ids
@@ -0,0 +1,36 @@
+
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Không được load khi chỉ import CLI hoặc chạy --help (xem cli.py: import lazy theo lệnh)
+HEAVY_MODULES = ["pandas", "aiohttp", "bs4", "lxml", "sqlalchemy", "dotenv", "tiki_scraper.config.settings"]
+
+
+def run_python(args, tmp_path):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = SRC_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run([sys.executable] + args, cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    return proc
+
+
+def test_import_cli_does_not_load_heavy_modules(tmp_path):
+    code = (
+        "import sys, tiki_scraper.cli\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert run_python(["-c", code], tmp_path).stdout.strip() == ""
+
+
+def test_help_does_not_load_heavy_modules(tmp_path):
+    proc = run_python(["-X", "importtime", "-m", "tiki_scraper.cli", "--help"], tmp_path)
+    imported = {
+        line.rsplit("|", 1)[1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+    assert "tiki_scraper.cli" in imported
+    assert [m for m in HEAVY_MODULES if m in imported] == []
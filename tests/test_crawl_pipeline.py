@@ -0,0 +1,30 @@
+
+import json
+from tiki_scraper.pipelines.crawl_pipeline import TikiPipeline
+
+
+class StubScheduler:
+    def __init__(self, ranked):
+        self.ranked = ranked
+
+    def order(self, pending_ids):
+        return [pid for pid in self.ranked if pid in pending_ids]
+
+
+def test_scheduled_refresh_resumes_from_output_dir(tmp_path):
+    input_file = tmp_path / "input.csv"
+    input_file.write_text("id\n1\n2\n3\n4\n", encoding='utf-8')
+    output_dir = tmp_path / "refresh"
+    output_dir.mkdir()
+    (output_dir / "products_batch_001.json").write_text(json.dumps([{'id': 2}]), encoding='utf-8')
+
+    pipeline = TikiPipeline(
+        input_file=str(input_file), output_dir=str(output_dir), log_dir=str(tmp_path / "logs"),
+        scheduler=StubScheduler(["3", "2", "1"]),
+    )
+    pending_ids, total, done = pipeline.load_pending_ids()
+
+    # Giữ thứ tự xếp hạng, bỏ ID đã crawl trong thư mục refresh; "4" bị scheduler bỏ qua
+    assert pending_ids == ["3", "1"]
+    assert total == 3
+    assert done == 1
@@ -0,0 +1,104 @@
+
+import csv
+import os
+from datetime import datetime
+import pytest
+from sqlalchemy.exc import OperationalError
+from tiki_scraper.etl import export
+from tiki_scraper.etl.export import EXPORT_COLUMNS, build_export_query, export_products
+
+
+class FakeResult:
+    def __init__(self, rows, fail_after=None):
+        self.rows = rows
+        self.fail_after = fail_after
+
+    def partitions(self, size):
+        for i in range(0, len(self.rows), size):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise OperationalError("SELECT", {}, Exception("connection lost"))
+            yield self.rows[i:i + size]
+
+
+class FakeConnection:
+    def __init__(self, result):
+        self.result = result
+        self.options = None
+        self.executed = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execution_options(self, **options):
+        self.options = options
+        return self
+
+    def execute(self, query, params):
+        self.executed = (str(query), params)
+        return self.result
+
+
+class FakeEngine:
+    def __init__(self, result):
+        self.conn = FakeConnection(result)
+
+    def connect(self):
+        return self.conn
+
+
+def test_build_export_query_rejects_unknown_columns():
+    with pytest.raises(ValueError):
+        build_export_query(['id', 'price; DROP TABLE tiki_products'])
+
+
+def test_build_export_query_without_filters():
+    query, params, columns = build_export_query()
+    assert columns == EXPORT_COLUMNS
+    assert params == {}
+    assert "WHERE" not in str(query)
+    assert str(query).endswith("ORDER BY id")
+
+
+def test_build_export_query_since_until():
+    since, until = datetime(2024, 1, 1), datetime(2024, 2, 1)
+    query, params, columns = build_export_query(['id', 'price'], since=since, until=until)
+    sql = str(query)
+    assert sql.startswith("SELECT id, price FROM tiki_products")
+    assert "crawled_at > :since" in sql
+    assert "crawled_at <= :until" in sql
+    assert sql.endswith("ORDER BY id")
+    assert params == {'since': since, 'until': until}
+    assert columns == ['id', 'price']
+
+
+def test_export_csv_streams_chunks_and_replaces_atomically(tmp_path, monkeypatch):
+    rows = [(i, f"sp {i}", 1000 * i) for i in range(1, 6)]
+    engine = FakeEngine(FakeResult(rows))
+    monkeypatch.setattr(export, "get_engine", lambda: engine)
+    output = tmp_path / "out.csv"
+
+    total = export_products(str(output), fmt='csv', columns=['id', 'name', 'price'], chunk_size=2)
+
+    assert total == 5
+    assert engine.conn.options == {'stream_results': True, 'max_row_buffer': 2}
+    assert not os.path.exists(f"{output}.partial")
+    with open(output, encoding='utf-8') as f:
+        lines = list(csv.reader(f))
+    assert lines[0] == ['id', 'name', 'price']
+    assert lines[1:] == [[str(c) for c in row] for row in rows]
+
+
+def test_export_failure_leaves_no_output(tmp_path, monkeypatch):
+    rows = [(i,) for i in range(10)]
+    monkeypatch.setattr(export, "get_engine", lambda: FakeEngine(FakeResult(rows, fail_after=4)))
+    output = tmp_path / "out.csv"
+    output.write_text("previous snapshot", encoding='utf-8')
+
+    with pytest.raises(OperationalError):
+        export_products(str(output), fmt='csv', columns=['id'], chunk_size=2)
+
+    assert not os.path.exists(f"{output}.partial")
+    assert output.read_text(encoding='utf-8') == "previous snapshot"
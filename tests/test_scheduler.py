@@ -0,0 +1,80 @@
+
+import logging
+import pytest
+from tiki_scraper.pipelines.scheduler import (
+    PRIOR_CHANGES, PRIOR_DAYS, RefreshScheduler, change_rate, refresh_score,
+)
+
+logger = logging.getLogger("test_scheduler")
+
+
+def make_scheduler(stats, **kwargs):
+    scheduler = RefreshScheduler(logger=logger, **kwargs)
+    scheduler.fetch_stats = lambda ids: stats
+    return scheduler
+
+
+def test_change_rate_prior_without_history():
+    assert change_rate(0, 0) == pytest.approx(PRIOR_CHANGES / PRIOR_DAYS)
+    assert change_rate(None, None) == pytest.approx(PRIOR_CHANGES / PRIOR_DAYS)
+    assert change_rate(-3, -1.0) == pytest.approx(PRIOR_CHANGES / PRIOR_DAYS)
+
+
+def test_change_rate_converges_to_observed_rate():
+    # 100 lần đổi giá trong 100 ngày -> ~1 lần/ngày khi nhiều dữ liệu
+    assert change_rate(100, 100) == pytest.approx((100 + PRIOR_CHANGES) / (100 + PRIOR_DAYS))
+    assert change_rate(100, 100) > change_rate(1, 100)
+
+
+def test_refresh_score_bounds():
+    assert refresh_score(1.0, 0) == 0.0
+    assert refresh_score(1.0, -5) == 0.0
+    assert 0.0 < refresh_score(0.1, 3) < 1.0
+    assert refresh_score(10.0, 1000) == pytest.approx(1.0)
+
+
+def test_volatile_and_stale_products_rank_first():
+    stats = {
+        "1": (0, 60.0, 1.0),    # ổn định, vừa crawl
+        "2": (30, 60.0, 1.0),   # biến động, vừa crawl
+        "3": (0, 60.0, 30.0),   # ổn định, lâu chưa crawl
+    }
+    ordered = make_scheduler(stats).order(["1", "2", "3"])
+    assert ordered[-1] == "1"
+    assert set(ordered[:2]) == {"2", "3"}
+
+
+def test_unknown_ids_score_one_and_come_first():
+    stats = {"1": (30, 60.0, 10.0)}
+    ordered = make_scheduler(stats).order(["1", "404"])
+    assert ordered[0] == "404"
+    assert "1" in ordered
+
+
+def test_min_score_and_max_ids_trim():
+    stats = {
+        "1": (0, 60.0, 0.01),
+        "2": (30, 60.0, 5.0),
+        "3": (30, 60.0, 10.0),
+    }
+    assert "1" not in make_scheduler(stats, min_score=0.5).order(["1", "2", "3"])
+    assert make_scheduler(stats, max_ids=2).order(["1", "2", "3", "new"]) == ["new", "3"]
+
+
+def test_db_error_keeps_original_order():
+    scheduler = RefreshScheduler(logger=logger, max_ids=2)
+
+    def broken(ids):
+        raise ImportError("no psycopg2")
+
+    scheduler.fetch_stats = broken
+    assert scheduler.order(["3", "1", "2"]) == ["3", "1"]
+
+    scheduler.max_ids = None
+    assert scheduler.order(["3", "1", "2"]) == ["3", "1", "2"]
+
+
+@pytest.mark.parametrize("kwargs", [{"min_score": 1.5}, {"min_score": -0.1}, {"max_ids": 0}, {"max_ids": -5}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        RefreshScheduler(**kwargs)